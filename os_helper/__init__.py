@@ -17,121 +17,124 @@ Authors:
 
 
 
-from .system_utils import (
-    windows,
-    linux,
-    macos,
-    unix,
-    get_nb_workers,
-    system,
-    openfile,
-    getpid,
-)
-
-from .temp_utils import (
-    temporary_filename,
-    temporary_folder,
-)
-
-from .path_utils import (
-    file_exists,
-    dir_exists,
-    absolute2relative_path,
-    relative2absolute_path,
-    path_without_home,
-    recursive_glob,
-    size_file,
-    checkfile,
-    copyfile,
-    remove_directory,
-    remove_files,
-    make_directory,
-    join,
-    folder_name_ext,
-)
-
-from .hash_utils import (
-    hash_string,
-    hashfile,
-    hashfolder,
-)
-
-
-from .config_utils import (
-    get_config,
-)
-
-from .string_utils import (
-    emptystring,
-    asciistring,
-)
-
-from .misc_utils import (
-    now_string,
-    format_size,
-    is_working_url,
-    zip_folder,
-    download_file,
-    time2str,
-    str2time,
-    get_user_ip,
-)
-
-# If you don’t have a main.py (or if everything is distributed among the modules above),
-# then just import from those modules directly.
-
-__all__ = [
-    # system_utils
-    "windows",
-    "linux",
-    "macos",
-    "unix",
-    "get_nb_workers",
-    "system",
-    "openfile",
-    "getpid",
-
-    # temp_utils
-    "temporary_filename",
-    "temporary_folder",
-
-    # path_utils
-    "file_exists",
-    "dir_exists",
-    "absolute2relative_path",
-    "relative2absolute_path",
-    "path_without_home",
-    "recursive_glob",
-    "os_path_constructor",
-    "size_file",
-    "checkfile",
-    "copyfile",
-    "remove_directory",
-    "remove_files",
-    "make_directory",
-    "join",
-
-    # hash_utils
-    "hash_string",
-    "hashfile",
-    "hashfolder",
-
-    # config_utils
-    "get_config",
-
-    # string_utils
-    "emptystring",
-    "asciistring",
-    "time2str",
-    "str2time",
-
-    # misc_utils
-    "now_string",
-    "format_size",
-    "folder_description",
-    "folder_name_ext",
-    "is_working_url",
-    "zip_folder",
-    "download_file",
-    "get_user_ip",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the submodule defining them.
+# Submodules are only imported on first attribute access (PEP 562), so that
+# e.g. `from os_helper import hash_string` does not pay for `yaml` or `requests`.
+_SUBMODULES = {
+    "system_utils": (
+        "windows",
+        "linux",
+        "macos",
+        "unix",
+        "get_nb_workers",
+        "system",
+        "openfile",
+        "getpid",
+    ),
+    "temp_utils": (
+        "temporary_filename",
+        "temporary_folder",
+    ),
+    "path_utils": (
+        "file_exists",
+        "dir_exists",
+        "absolute2relative_path",
+        "relative2absolute_path",
+        "path_without_home",
+        "recursive_glob",
+        "size_file",
+        "checkfile",
+        "copyfile",
+        "remove_directory",
+        "remove_files",
+        "make_directory",
+        "join",
+        "folder_name_ext",
+    ),
+    "hash_utils": (
+        "hash_string",
+        "hashfile",
+        "hashfolder",
+    ),
+    "config_utils": (
+        "get_config",
+    ),
+    "string_utils": (
+        "emptystring",
+        "asciistring",
+    ),
+    "misc_utils": (
+        "now_string",
+        "format_size",
+        "is_working_url",
+        "is_working_urls",
+        "zip_folder",
+        "download_file",
+        "time2str",
+        "str2time",
+        "get_user_ip",
+    ),
+}
+
+_LAZY = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+# Every public name is exported exactly once, grouped by submodule,
+# so that `from os_helper import *` never refers to a missing name
+__all__ = [name for names in _SUBMODULES.values() for name in names]
+
+
+if TYPE_CHECKING:
+    # Static view of the lazy exports, for type checkers and IDEs
+    from . import config_utils, hash_utils, misc_utils, path_utils, string_utils, system_utils, temp_utils
+    from .system_utils import windows, linux, macos, unix, get_nb_workers, system, openfile, getpid
+    from .temp_utils import temporary_filename, temporary_folder
+    from .path_utils import (
+        file_exists,
+        dir_exists,
+        absolute2relative_path,
+        relative2absolute_path,
+        path_without_home,
+        recursive_glob,
+        size_file,
+        checkfile,
+        copyfile,
+        remove_directory,
+        remove_files,
+        make_directory,
+        join,
+        folder_name_ext,
+    )
+    from .hash_utils import hash_string, hashfile, hashfolder
+    from .config_utils import get_config
+    from .string_utils import emptystring, asciistring
+    from .misc_utils import (
+        now_string,
+        format_size,
+        is_working_url,
+        is_working_urls,
+        zip_folder,
+        download_file,
+        time2str,
+        str2time,
+        get_user_ip,
+    )
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        # Importing a submodule also binds it in this package's namespace
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    value = getattr(module, name)
+    # Cache the attribute so that later accesses bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -0,0 +1,66 @@
+"""
+Cache Utilities
+
+This module provides the small bounded cache shared by the other modules
+to remember file digests, parsed configurations and URL checks.
+
+Authors:
+ - Warith Harchaoui, https://harchaoui.org/warith
+ - Mohamed Chelali, https://mchelali.github.io
+ - Bachir Zerroug, https://www.linkedin.com/in/bachirzerroug
+"""
+
+import threading
+from typing import Any, Dict, Hashable
+
+
+class _BoundedCache:
+    """
+    A thread-safe dictionary holding at most `max_entries` items,
+    evicting the oldest inserted entry first when it is full.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    max_entries : int
+        The maximum number of entries kept.
+
+    Example
+    -------
+    >>> cache = _BoundedCache(max_entries=2)
+    >>> cache.put("a", 1); cache.put("b", 2); cache.put("c", 3)
+    >>> cache.get("a"), cache.get("c")
+    (None, 3)
+    """
+
+    def __init__(self, max_entries: int):
+        self._entries: Dict[Hashable, Any] = {}
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get the value stored for `key`, or `default` if there is none.
+        """
+        return self._entries.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store `value` for `key`, evicting the oldest entry if the cache is full.
+        """
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                # Dictionaries keep insertion order: the first key is the oldest one
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = value
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
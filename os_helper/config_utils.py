@@ -14,27 +14,61 @@ Authors:
  - Bachir Zerroug, https://www.linkedin.com/in/bachirzerroug
 """
 
+import copy
 import os
+import stat
 import json
-import glob
-import re
 from typing import List, Dict, Optional, Union
 
-import yaml
-from dotenv import load_dotenv
-
 # Importing necessary functions from other utility modules
 # from .logging_utils import info, error, check
 import logging
-from .path_utils import file_exists, dir_exists, join, checkfile, folder_name_ext
+from .path_utils import file_exists
 from .string_utils import emptystring
+from .cache_utils import _BoundedCache
+
+logger = logging.getLogger(__name__)
+
+# Extensions of the configuration files looked up when `get_config` is given a folder
+_CONFIG_EXTENSIONS = {".json", ".yaml", ".yml"}
+
+
+def _yaml_loads(data: bytes) -> Optional[Dict]:
+    """
+    Parse a YAML document, importing `yaml` only when a YAML file is actually read.
+
+    The libyaml-based `CSafeLoader` is used when PyYAML was built with it,
+    falling back to the pure-Python `SafeLoader` otherwise.
+
+    You should not use it directly.
+    """
+    import yaml
+    return yaml.load(data, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+# Parsed configurations keyed by (absolute path, modification time in ns, size),
+# so that an unchanged file is not parsed again
+_CONFIG_CACHE = _BoundedCache(max_entries=256)
+# Marks a configuration missing from the cache (None is the parse result of an empty file)
+_NOT_CACHED = object()
+
+# Parser of each supported configuration file extension
+_PARSERS = {
+    "json": json.loads,
+    "yaml": _yaml_loads,
+    "yml": _yaml_loads,
+}
 
-def _valid_config_file(a_path: str, keys: List[str], config_type: str) -> Optional[Dict]:
+def _load_config(
+    a_path: str,
+    ext_hint: Optional[str] = None,
+    st: Optional[os.stat_result] = None,
+) -> Optional[Dict]:
     """
-    Check if a configuration file is valid by verifying it contains the required keys.
+    Parse a configuration file (in JSON or YAML format).
 
-    This function loads a configuration file (in JSON or YAML format) and checks if it contains 
-    all the specified keys.
+    The file is assumed to exist: callers have already checked it. Parsed contents are
+    cached by path, modification time and size, so an unchanged file is parsed only once.
 
     You should not use it directly.
 
@@ -42,45 +76,89 @@ def _valid_config_file(a_path: str, keys: List[str], config_type: str) -> Option
     ----------
     a_path : str
         The path to the configuration file.
-    keys : List[str]
-        List of keys that must be present in the configuration file.
-    config_type : str
-        The type of configuration (for logging purposes).
+    ext_hint : Optional[str], optional
+        The lowercase extension of the file (e.g. "yaml") when the caller already knows it,
+        which spares decomposing the path again. Defaults to None.
+    st : Optional[os.stat_result], optional
+        The result of `os.stat` on the file when the caller already has it,
+        which spares stat-ing it again. Defaults to None.
 
     Returns
     -------
     Optional[Dict]
-        The loaded configuration dictionary if valid, otherwise None.
+        The parsed configuration, or None if the format is unsupported or the file is empty.
 
     Example
     -------
-    >>> valid_config_file("config.yaml", ["host", "port"], "database")
+    >>> _load_config("config.yaml")
     {'host': 'localhost', 'port': 5432}
-    """    
-    checkfile(a_path, f"Configuration file for {config_type} does not exist: {a_path}")
-    
-    _, _, ext = folder_name_ext(a_path)
-    ext = ext.lower()
+    """
+    if ext_hint is None:
+        # Pure string work, no stat: only the last suffix matters, e.g. "app.config.yml" -> "yml"
+        ext = os.path.splitext(a_path)[1][1:]
+        ext_hint = ext.lower()
+    else:
+        ext = ext_hint
+    parser = _PARSERS.get(ext_hint)
+    if parser is None:
+        logger.info("Unsupported configuration file format %s: %s", ext, a_path)
+        return None
+
+    if st is None:
+        st = os.stat(a_path)
+    key = (os.path.abspath(a_path), st.st_mtime_ns, st.st_size)
+    config = _CONFIG_CACHE.get(key, _NOT_CACHED)
+    if config is _NOT_CACHED:
+        # Both parsers accept raw bytes, which skips the text-mode decoding layer
+        with open(a_path, "rb") as fin:
+            config = parser(fin.read())
+        _CONFIG_CACHE.put(key, config)
 
-    config = None
-    with open(a_path, "r") as fin:
-        if "json" in ext:
-            config = json.load(fin)
-        elif any([e in ext for e in ["yaml", "yml"]]):
-            config = yaml.load(fin, Loader=yaml.SafeLoader)
-    
     if config is None:
-        logging.info(f"Unsupported configuration file format {ext}: {a_path}")
+        logger.info("Empty configuration file: %s", a_path)
         return None
+    # Callers get their own copy, so that changing it leaves the cached one intact
+    return copy.deepcopy(config)
+
+
+def _match_keys(config: Dict, keys: List[str], config_type: str, a_path: str) -> Optional[Dict]:
+    """
+    Check that a parsed configuration contains the required keys.
+
+    You should not use it directly.
 
-    if all(key in config for key in keys):
-        logging.info(f"Configuration '{config_type}' successfully loaded from '{a_path}'")
+    Parameters
+    ----------
+    config : Dict
+        The parsed configuration.
+    keys : List[str]
+        List of keys that must be present in the configuration.
+    config_type : str
+        The type of configuration (for logging purposes).
+    a_path : str
+        The path the configuration was loaded from (for logging purposes).
+
+    Returns
+    -------
+    Optional[Dict]
+        The configuration dictionary if it has all the keys, otherwise None.
+
+    Example
+    -------
+    >>> _match_keys({"host": "localhost", "port": 5432}, ["host", "port"], "database", "config.yaml")
+    {'host': 'localhost', 'port': 5432}
+    """
+    # One pass over the keys, against the keys view of the configuration
+    config_keys = config.keys() if isinstance(config, dict) else config
+    missing = [key for key in keys if key not in config_keys]
+    if not missing:
+        logger.info("Configuration '%s' successfully loaded from '%s'", config_type, a_path)
         return config
-    else:
-        missing = [key for key in keys if key not in config]
+
+    # Skip building the message when INFO records are filtered out
+    if logger.isEnabledFor(logging.INFO):
         m = ", ".join(missing)
-        logging.info(f"Configuration file '{a_path}' does not have all keys. Missing keys are {m}")
-    
+        logger.info("Configuration file '%s' does not have all keys. Missing keys are %s", a_path, m)
     return None
 
 def _config_from_env(keys: List[str]) -> Optional[Dict[str, Union[str, int, float]]]:
@@ -99,23 +177,24 @@ def _config_from_env(keys: List[str]) -> Optional[Dict[str, Union[str, int, floa
     Optional[Dict[str, Union[str, int, float]]]
         A dictionary of key-value pairs if all keys are found, otherwise None.
     """
+    environ = os.environ
     config = {}
     missing_keys = []
     for key in keys:
-        cap_key = key.upper()
-        # capitals case
-        if cap_key in os.environ:
-            config[key] = os.environ[cap_key]
-        # lowercase case
-        elif key in os.environ:
-            config[key] = os.environ[key]
-        else:
+        # capitals case first, then lowercase case, with a single lookup each
+        value = environ.get(key.upper())
+        if value is None:
+            value = environ.get(key)
+        if value is None:
             missing_keys.append(key)
+        else:
+            config[key] = value
     if len(missing_keys) == 0:
         return config
     
-    m = ", ".join(missing_keys)
-    logging.info(f"Missing keys in environment variables: {m}")
+    if logger.isEnabledFor(logging.INFO):
+        m = ", ".join(missing_keys)
+        logger.info("Missing keys in environment variables: %s", m)
     return None
 
 
@@ -162,40 +241,56 @@ def get_config(
 
 
     # Step 1: Attempt to load from a specific file or folder if `path` is provided
-    logging.info(f"Loading configuration for '{config_type}'")
+    logger.info("Loading configuration for '%s'", config_type)
     config = None
     if not emptystring(path):
-        if file_exists(path):
-            config = _valid_config_file(path, keys)
+        # A single stat tells files from folders, and is reused to load a file
+        try:
+            st = os.stat(path)
+            mode = st.st_mode
+        except OSError:
+            st, mode = None, 0
+        if stat.S_ISREG(mode):
+            config = _load_config(path, st=st)
+            if not (config is None):
+                config = _match_keys(config, keys, config_type, path)
             if not (config is None):
-                logging.info(f"No valid configuration found in path: {path}")
                 return config
-        if dir_exists(path):
-            ext = ["json", "yaml", "yml"]
+        elif stat.S_ISDIR(mode):
+            # One directory scan with a case-insensitive extension check,
+            # keeping the extension so that it is not computed again.
+            # Hidden files are skipped, as the former glob("*") listing did.
             candidates = []
-            for e in ext:
-                candidates.extend(glob.glob(join(path, f"*.{e}")))
-            candidates = sorted(candidates)
-            for candidate_path in candidates:
-                config = _valid_config_file(candidate_path, keys, config_type)
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext in _CONFIG_EXTENSIONS and entry.is_file():
+                        candidates.append((entry.path, ext[1:]))
+            candidates.sort()
+            for candidate_path, ext_hint in candidates:
+                config = _load_config(candidate_path, ext_hint=ext_hint)
+                if not (config is None):
+                    config = _match_keys(config, keys, config_type, candidate_path)
                 if not (config is None):
-                    logging.info(f"No valid configuration found in path: {candidate_path}")
                     return config
-        logging.info(f"No valid configuration found in path: {path}")
+        logger.info("No valid configuration found in path: %s", path)
 
     # Step 2: Merge all .env files into os.environ
-    logging.info("Loading configuration from env files")
+    logger.info("Loading configuration from env files")
     for env_file in env_files:
         if file_exists(env_file):
+            from dotenv import load_dotenv  # deferred: only .env configurations pay for it
             load_dotenv(env_file)
-            logging.info(f"Loaded env file: {env_file}")
+            logger.info("Loaded env file: %s", env_file)
 
     # Step 3: Check os.environ for required keys
-    logging.info("Loading configuration from environment variables (possibly merged with .env files)")
+    logger.info("Loading configuration from environment variables (possibly merged with .env files)")
     config = _config_from_env(keys)
     if not(config is None):
-        logging.info(f"Configuration '{config_type}' successfully loaded from environment variables.")
+        logger.info("Configuration '%s' successfully loaded from environment variables.", config_type)
         return config
 
     # Step 4: Raise an error if no configuration was found
-    logging.error(f"Missing required keys for '{config_type}' configuration in files, .env files, or environment variables.")
+    logger.error("Missing required keys for '%s' configuration in files, .env files, or environment variables.", config_type)
@@ -11,30 +11,175 @@ Authors:
  - Bachir Zerroug, https://www.linkedin.com/in/bachirzerroug
 """
 
+import functools
 import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 # If you keep 'file_exists' and 'dir_exists' in path_utils:
-from .path_utils import file_exists, dir_exists
+from .path_utils import file_exists, dir_exists, _scandir_recursive
 
 from .misc_utils import now_string  # or from .main import now_string
+from .system_utils import get_nb_workers
+from .cache_utils import _BoundedCache
 
 # If you need logging or error-checking:
 # from .logging_utils import check, info, error
 import logging
 
+# Algorithm used by every hash of this module (always available, see hashlib.algorithms_guaranteed)
+_HASH_ALGORITHM = "sha256"
+
+# Size of the blocks streamed into the hash engine when hashing file contents
+_CHUNK_SIZE = 1 << 20
+
+# Folders with less content than this are hashed without a thread pool
+_PARALLEL_MIN_BYTES = 1 << 22
+
+# Digests of the files hashed by `hashfolder`, keyed by (absolute path, inode, size, mtime in ns),
+# so that re-hashing a slowly-changing folder only reads the files that changed
+_DIGEST_CACHE = _BoundedCache(max_entries=65536)
+
+# Strings longer than this are hashed without going through the `hash_string` cache
+_CACHED_STRING_MAX_LENGTH = 4096
+
 def _hash_engine() -> hashlib:
     """
-    Create a new hash engine using the RIPEMD-160 algorithm.
+    Create a new hash engine using the SHA-256 algorithm.
+
+    SHA-256 is always available in hashlib (RIPEMD-160 is relegated to the
+    OpenSSL legacy provider on recent systems) and benefits from the SHA
+    extensions of modern x86-64 and ARMv8 CPUs.
 
     Your are not supposed to use this function directly.
 
     Returns
     -------
     hashlib
-        A new hash engine instance using the RIPEMD-160 algorithm.
+        A new hash engine instance using the SHA-256 algorithm.
+    """
+    return hashlib.new(_HASH_ALGORITHM)
+
+
+def _update_from_file(h, path: str) -> None:
+    """
+    Feed the contents of a file into a hash engine without reading it into a bytes object.
+
+    The file is read block by block into a single reused buffer of `_CHUNK_SIZE` bytes.
+    Files are not memory-mapped: a file truncated while being hashed (e.g. a rotating log)
+    would then crash the interpreter with SIGBUS, whereas reads just come up short.
+
+    Your are not supposed to use this function directly.
+
+    Parameters
+    ----------
+    h : hashlib
+        The hash engine to update.
+    path : str
+        The path to the file to hash.
+    """
+    buf = bytearray(_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb") as fi:
+        while True:
+            n = fi.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+
+
+def _digest_file(path: str) -> bytes:
     """
-    return hashlib.new("ripemd160")
+    Compute the raw digest of a single file's contents.
+
+    Used as the per-file worker of `hashfolder`; hashlib releases the GIL while
+    hashing, so several files can be digested concurrently by threads.
+
+    Your are not supposed to use this function directly.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file to hash.
+
+    Returns
+    -------
+    bytes
+        The raw digest of the file contents.
+    """
+    h = _hash_engine()
+    _update_from_file(h, path)
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_string_cached(s: str, size: int) -> str:
+    """
+    Memoized implementation of `hash_string`, which is often called repeatedly
+    on the same short strings (e.g. to build cache keys or file names).
+
+    Your are not supposed to use this function directly.
+    """
+    h = _hash_engine()
+    h.update(s.encode("utf-8"))
+    full_hash = h.hexdigest()
+    if size > 0:
+        # Repeat the digest as many times as needed in a single string multiplication
+        repeats = -(-size // len(full_hash))
+        full_hash = (full_hash * repeats)[:size]
+    return full_hash
+
+
+def _digest_files(paths: List[str], total_size: int) -> List[bytes]:
+    """
+    Compute the raw digests of several files, in parallel threads for large workloads.
+
+    Threads are enough: hashlib releases the GIL while hashing, and reading is I/O bound.
+    Below `_PARALLEL_MIN_BYTES` (or for a single file), starting a pool costs more than
+    it saves, so the files are digested in the calling thread.
+
+    Your are not supposed to use this function directly.
+
+    Parameters
+    ----------
+    paths : List[str]
+        The paths of the files to hash.
+    total_size : int
+        The total size of the files in bytes.
+
+    Returns
+    -------
+    List[bytes]
+        The raw digests, in the order of `paths`.
+    """
+    if len(paths) < 2 or total_size < _PARALLEL_MIN_BYTES:
+        return [_digest_file(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=get_nb_workers()) as executor:
+        return list(executor.map(_digest_file, paths))
+
+
+def _fingerprint_file(path: str) -> bytes:
+    """
+    Compute a cheap fingerprint of a file from its size and modification time.
+
+    A single `os.stat` call answers "has this file changed?" without reading it,
+    as build systems like make or ninja do.
+
+    Your are not supposed to use this function directly.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+
+    Returns
+    -------
+    bytes
+        The encoded (size, modification time in ns) pair.
+    """
+    st = os.stat(path)
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}".encode("utf-8")
 
 
 def hash_string(s: str, size: int = -1) -> str:
@@ -56,21 +201,17 @@ def hash_string(s: str, size: int = -1) -> str:
     Example
     -------
     >>> hash_string("example")
-    '9c1185a5c5e9fc54612808977ee8f548b2258d31'
+    '50d858e0985ecc7f60418aaf0cc5ab587f42c2570a884095a9e8ccacd0f6545c'
     >>> hash_string("example", size=8)
-    '9c1185a5'
+    '50d858e0'
     """
-    h = _hash_engine()
-    h.update(s.encode("utf-8"))
-    full_hash = h.hexdigest()
-    if size > 0:
-        while size > len(full_hash):
-            full_hash += full_hash
-        full_hash = full_hash[:size]
-    return full_hash
+    # Large inputs are not worth keeping in the cache
+    if len(s) > _CACHED_STRING_MAX_LENGTH:
+        return _hash_string_cached.__wrapped__(s, size)
+    return _hash_string_cached(s, size)
 
 
-def hashfile(path: str, hash_content: bool = True, date: bool = False) -> str:
+def hashfile(path: str, hash_content: bool = True, date: bool = False, fingerprint: bool = False) -> str:
     """
     Generate a hash for a file's content and/or its last modification date.
 
@@ -82,6 +223,10 @@ def hashfile(path: str, hash_content: bool = True, date: bool = False) -> str:
         If True, includes the file's content in the hash (default: True).
     date : bool, optional
         If True, includes the current date in the hash (default: False).
+    fingerprint : bool, optional
+        If True (with `hash_content`), hashes the file's size and modification time
+        instead of reading its content: much faster for change detection,
+        but not a content digest (default: False).
 
     Returns
     -------
@@ -91,8 +236,12 @@ def hashfile(path: str, hash_content: bool = True, date: bool = False) -> str:
     Example
     -------
     >>> hashfile("example.txt")
-    '9c1185a5c5e9fc54612808977ee8f548b2258d31'
+    '50d858e0985ecc7f60418aaf0cc5ab587f42c2570a884095a9e8ccacd0f6545c'
     """
+    # Content only: the digest of the file is the result
+    if hash_content and not (date or fingerprint) and file_exists(path):
+        return _digest_file(path).hex()
+
     h = _hash_engine()
 
     # Optionally incorporate current date into the hash
@@ -101,8 +250,10 @@ def hashfile(path: str, hash_content: bool = True, date: bool = False) -> str:
 
     # If the file exists and we want to hash its content
     if hash_content and file_exists(path):
-        with open(path, "rb") as fi:
-            h.update(fi.read())
+        if fingerprint:
+            h.update(_fingerprint_file(path))
+        else:
+            _update_from_file(h, path)
     else:
         # Otherwise, just hash the path
         h.update(path.encode("utf-8"))
@@ -110,10 +261,21 @@ def hashfile(path: str, hash_content: bool = True, date: bool = False) -> str:
     return h.hexdigest()
 
 
-def hashfolder(path: str, hash_content: bool = True, hash_path: bool = False, date: bool = False) -> str:
+def hashfolder(
+    path: str,
+    hash_content: bool = True,
+    hash_path: bool = False,
+    date: bool = False,
+    fingerprint: bool = False
+) -> str:
     """
     Generate a hash for the contents of a folder and/or its path.
 
+    The content hash covers the relative path and the contents of every non-hidden file,
+    in sorted order, so it does not depend on the file system listing order.
+    File digests are memoized across calls by (path, inode, size, modification time):
+    a file rewritten in place with the same size and timestamp is not read again.
+
     Parameters
     ----------
     path : str
@@ -124,6 +286,9 @@ def hashfolder(path: str, hash_content: bool = True, hash_path: bool = False, da
         If True, includes the folder's path in the hash (default: False).
     date : bool, optional
         If True, includes the current date in the hash (default: False).
+    fingerprint : bool, optional
+        If True (with `hash_content`), hashes each file's size and modification time
+        instead of reading its content (default: False).
 
     Returns
     -------
@@ -133,7 +298,7 @@ def hashfolder(path: str, hash_content: bool = True, hash_path: bool = False, da
     Example
     -------
     >>> hashfolder("/path/to/folder")
-    '9c1185a5c5e9fc54612808977ee8f548b2258d31'
+    '50d858e0985ecc7f60418aaf0cc5ab587f42c2570a884095a9e8ccacd0f6545c'
     """
     h = _hash_engine()
     
@@ -142,14 +307,39 @@ def hashfolder(path: str, hash_content: bool = True, hash_path: bool = False, da
         h.update(now_string("log").encode("utf-8"))
 
     if hash_content and dir_exists(path):
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                # Optionally skip hidden files
-                if not file.startswith("."):
-                    full_path = os.path.join(root, file)
-                    # Hash the contents of each file
-                    with open(full_path, "rb") as fi:
-                        h.update(fi.read())
+        # Scanning from the absolute root gives absolute entry paths, ready for the cache keys
+        root = os.path.abspath(path)
+        # Relative paths with '/' separators, sorted as such, so that neither the file system
+        # listing order nor the native separator (which sorts differently) changes the hash
+        pairs = sorted(
+            (os.path.relpath(entry.path, root).replace(os.sep, "/"), entry)
+            for entry in _scandir_recursive(root)
+        )
+        relative_paths = [rel for rel, _ in pairs]
+        entries = [entry for _, entry in pairs]
+        files = [entry.path for entry in entries]
+
+        if fingerprint:
+            # A stat per file is cheap enough to stay in the calling thread
+            digests = [_fingerprint_file(f) for f in files]
+        else:
+            # Only the files that changed since they were last digested are read
+            keys = []
+            for entry in entries:
+                st = entry.stat()
+                keys.append((entry.path, st.st_ino, st.st_size, st.st_mtime_ns))
+            digests = [_DIGEST_CACHE.get(key) for key in keys]
+            misses = [i for i, digest in enumerate(digests) if digest is None]
+            total_size = sum(keys[i][2] for i in misses)
+            for i, digest in zip(misses, _digest_files([files[i] for i in misses], total_size)):
+                digests[i] = digest
+                _DIGEST_CACHE.put(keys[i], digest)
+
+        # Fold (relative path, digest) pairs in sorted order
+        for rel, digest in zip(relative_paths, digests):
+            h.update(rel.encode("utf-8"))
+            h.update(b"\0")
+            h.update(digest)
 
     if hash_path:
         # Include the folder path in the hash
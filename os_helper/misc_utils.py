@@ -21,17 +21,25 @@ Authors:
 import os
 import time
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import zipfile
-import requests
-import validators
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 
 from datetime import datetime
 
 import logging
-from .path_utils import file_exists, dir_exists, size_file, join
+from .path_utils import file_exists, dir_exists, size_file, join, _scandir_recursive
+from .cache_utils import _BoundedCache
+
+logger = logging.getLogger(__name__)
+
+# strftime patterns for each now_string format, formatted in a single call
+_NOW_FORMATS = {"log": "%Y/%m/%d-%H:%M:%S", "filename": "%Y-%m-%d-%H-%M-%S"}
+# Last string formatted for each strftime pattern, as pattern -> (Unix second, string)
+_NOW_CACHE: Dict[str, Tuple[int, str]] = {}
+
 
 def now_string(fmt: str = "log") -> str:
     """
@@ -49,12 +57,21 @@ def now_string(fmt: str = "log") -> str:
     str
         The formatted date-time string.
     """
-    result = datetime.now().strftime("%Y/%m/%d-%H:%M:%S")
-    if fmt == "filename":
-        result = result.replace("/", "-").replace(":", "-")
+    pattern = _NOW_FORMATS.get(fmt, _NOW_FORMATS["log"])
+    second = int(time.time())
+    cached = _NOW_CACHE.get(pattern)
+    if not (cached is None) and cached[0] == second:
+        return cached[1]
+    # Strings only change once per second: format on the first call of each second only
+    result = datetime.fromtimestamp(second).strftime(pattern)
+    _NOW_CACHE[pattern] = (second, result)
     return result
 
 
+# Size units from the largest down, as (threshold in bytes, unit) pairs
+_SIZE_UNITS = ((1e12, "TB"), (1e9, "GB"), (1e6, "MB"), (1e3, "KB"))
+
+
 def format_size(size: int) -> str:
     """
     Convert a file size in bytes to a human-readable string (B, KB, MB, GB).
@@ -69,16 +86,10 @@ def format_size(size: int) -> str:
     str
         Formatted size string (e.g. '1.23 MB', '456.00 KB', etc.).
     """
-    if size > 1e12:
-        return "%.2f TB" % (size / 1e12)
-    elif size > 1e9:
-        return "%.2f GB" % (size / 1e9)
-    elif size > 1e6:
-        return "%.2f MB" % (size / 1e6)
-    elif size > 1e3:
-        return "%.2f KB" % (size / 1e3)
-    else:
-        return "%d B" % int(size)
+    for threshold, unit in _SIZE_UNITS:
+        if size > threshold:
+            return "%.2f %s" % (size / threshold, unit)
+    return "%d B" % int(size)
 
 
 
@@ -162,11 +173,79 @@ def format_size(size: int) -> str:
 #     return result
 
 
+# Shared HTTP session, created on first use, so that URL checks reuse pooled keep-alive connections
+_SESSION = None
+_SESSION_POOL_SIZE = 32
+# Maximum number of URLs checked concurrently by `is_working_urls`
+_URL_CHECK_WORKERS = 16
+# URLs found working recently, as url -> time.monotonic() of the successful check
+_URL_CACHE = _BoundedCache(max_entries=4096)
+_URL_CACHE_TTL = 300.0  # seconds
+
+
+def _session():
+    """
+    Get the HTTP session shared by the URL helpers, creating it on first use.
+
+    You should not use it directly.
+
+    Returns
+    -------
+    requests.Session
+        The shared session, with a connection pool sized for concurrent checks.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_SESSION_POOL_SIZE, pool_maxsize=_SESSION_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _url_alive(url: str) -> bool:
+    """
+    Send the network request behind `is_working_url`, without caching.
+
+    A HEAD request is tried first. Servers that refuse HEAD (405 or 501) get a
+    streamed GET instead, whose body is never downloaded.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    url : str
+        A syntactically valid URL.
+
+    Returns
+    -------
+    bool
+        True if the URL answers, after redirects, with a status code below 400.
+    """
+    import requests
+
+    session = _session()
+    try:
+        resp = session.head(url, timeout=5, allow_redirects=True)
+        if resp.status_code in (405, 501):
+            with session.get(url, timeout=5, allow_redirects=True, stream=True) as resp:
+                return resp.status_code < 400
+        return resp.status_code < 400
+    except requests.RequestException:
+        return False
+
+
 def is_working_url(url: str) -> bool:
     """
     Check if a URL is valid and reachable.
 
-    This function validates a URL (syntax) and sends a HEAD request to see if it's reachable.
+    This function validates a URL (syntax) and sends a HEAD request to see if it's reachable,
+    following redirects. Requests go through a shared session, so repeated checks reuse open
+    connections, and a working URL is not checked again for 5 minutes.
 
     Parameters
     ----------
@@ -176,21 +255,66 @@ def is_working_url(url: str) -> bool:
     Returns
     -------
     bool
-        True if URL is valid and returns status_code=200, else False.
+        True if URL is valid and answers with a status code below 400, else False.
     """
+    # Imported lazily: validators is only needed for URL helpers
+    import validators
+
     if not validators.url(url):
         return False
-    try:
-        resp = requests.head(url, timeout=5)
-        return resp.status_code == 200
-    except requests.RequestException:
-        return False
 
+    now = time.monotonic()
+    checked = _URL_CACHE.get(url)
+    if not (checked is None) and now - checked < _URL_CACHE_TTL:
+        return True
+
+    # Only successes are remembered, so that a URL coming up is noticed at the next check
+    alive = _url_alive(url)
+    if alive:
+        _URL_CACHE.put(url, now)
+    return alive
 
-def zip_folder(folder_path: str, zip_file_path: str = "") -> None:
+
+def is_working_urls(urls: List[str]) -> List[bool]:
+    """
+    Check several URLs concurrently, see `is_working_url`.
+
+    Parameters
+    ----------
+    urls : List[str]
+        The URLs to check.
+
+    Returns
+    -------
+    List[bool]
+        For each URL, in the same order, True if it is valid and reachable.
+
+    Example
+    -------
+    >>> is_working_urls(["https://www.python.org", "not a url"])
+    [True, False]
+    """
+    if len(urls) < 2:
+        return [is_working_url(url) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(_URL_CHECK_WORKERS, len(urls))) as executor:
+        return list(executor.map(is_working_url, urls))
+
+
+# Extensions of already-compressed formats, stored as-is since deflating them again gains nothing
+_STORED_EXTENSIONS = frozenset({
+    ".zip", ".gz", ".bz2", ".xz", ".7z", ".rar",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp",
+    ".mp3", ".aac", ".ogg", ".mp4", ".mkv", ".mov", ".avi", ".webm",
+})
+
+
+def zip_folder(folder_path: str, zip_file_path: str = "", compresslevel: Optional[int] = None) -> None:
     """
     Zip the contents of a folder into a .zip file.
 
+    Files in already-compressed formats (images, audio, video, archives) are stored
+    without compression, the others are deflated.
+
     Parameters
     ----------
     folder_path : str
@@ -198,21 +322,28 @@ def zip_folder(folder_path: str, zip_file_path: str = "") -> None:
     zip_file_path : str, optional
         The path/name of the resulting .zip file. If empty,
         defaults to folder_path.zip
+    compresslevel : Optional[int], optional
+        The deflate level, from 0 (fastest) to 9 (smallest). Defaults to None,
+        i.e. zlib's default level.
     """
     assert dir_exists(folder_path), f"Folder '{folder_path}' does not exist"
     if not zip_file_path:
         zip_file_path = folder_path + ".zip"
 
-    with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                # skip hidden
-                if file.startswith("."):
-                    continue
-                full_path = os.path.join(root, file)
-                arcname = os.path.relpath(full_path, folder_path)
-                zf.write(full_path, arcname)
-    logging.info(f"Zipped folder '{folder_path}' into '{zip_file_path}'")
+    # Entry paths all start with the folder path and one separator, which slicing strips
+    prefix_len = len(os.path.join(folder_path, ""))
+
+    with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        for entry in _scandir_recursive(folder_path, skip_hidden=False):
+            # skip hidden
+            if entry.name.startswith("."):
+                continue
+            arcname = entry.path[prefix_len:]
+            if os.path.splitext(entry.name)[1].lower() in _STORED_EXTENSIONS:
+                zf.write(entry.path, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(entry.path, arcname)
+    logger.info("Zipped folder '%s' into '%s'", folder_path, zip_file_path)
 
 def time2str(seconds: float, no_space: bool = False) -> str:
     """
@@ -240,20 +371,22 @@ def time2str(seconds: float, no_space: bool = False) -> str:
     "1 hr 1 min 1 sec"
     
     """
-    # Convert seconds to time struct
-    time_struct = time.gmtime(seconds)
-    
+    # Split whole seconds into hours, minutes and seconds (hours are not capped at a day)
+    mins, secs = divmod(int(seconds), 60)
+    hrs, mins = divmod(mins, 60)
+    sep = "" if no_space else " "
+
+    # Fast path: under a minute, only seconds are shown
+    if not (hrs or mins):
+        return f"{secs}{sep}sec"
+
     parts = []
-    hrs = time_struct.tm_hour + (time_struct.tm_mday - 1) * 24
     if hrs:
-        parts.append(f"{hrs} hr")
-    if time_struct.tm_min:
-        parts.append(f"{time_struct.tm_min} min") 
-    if time_struct.tm_sec or (not hrs and not time_struct.tm_min):
-        parts.append(f"{time_struct.tm_sec} sec")
-
-    if no_space:
-        parts = [p.replace(" ", "") for p in parts]
+        parts.append(f"{hrs}{sep}hr")
+    if mins:
+        parts.append(f"{mins}{sep}min")
+    if secs:
+        parts.append(f"{secs}{sep}sec")
     return " ".join(parts)
 
 def str2time(input_string: str) -> float:
@@ -297,10 +430,10 @@ def str2time(input_string: str) -> float:
             elif len(parts) == 2:  # MM:SS
                 return parts[0] * 60 + parts[1]
             else:
-                logging.error(f"Invalid time format: {input_string} - expected 2 or 3 parts")
+                logger.error("Invalid time format: %s - expected 2 or 3 parts", input_string)
                 return 0.0
         except ValueError:
-            logging.error(f"Invalid time format: {input_string}")
+            logger.error("Invalid time format: %s", input_string)
             return 0.0
 
     # Handle text formats like "1 hour 30 minutes"
@@ -326,7 +459,7 @@ def str2time(input_string: str) -> float:
                     remaining = re.sub(pattern, "", remaining, count=1).strip()
                     found_unit = True
                 except ValueError:
-                    logging.error(f"Invalid numeric value in: {input_string}")
+                    logger.error("Invalid numeric value in: %s", input_string)
                     continue
 
     if found_unit:
@@ -336,7 +469,7 @@ def str2time(input_string: str) -> float:
     try:
         return float(input_string)
     except ValueError:
-        logging.error(f"Cannot parse time from: {input_string}")
+        logger.error("Cannot parse time from: %s", input_string)
         return 0.0
 
 
@@ -356,6 +489,8 @@ def download_file(url: str, file_path: str = "") -> None:
     SystemExit
         If the URL is invalid or unreachable.
     """
+    import requests
+
     assert is_working_url(url), f"URL '{url}' is not working"
 
     if not file_path:
@@ -367,15 +502,15 @@ def download_file(url: str, file_path: str = "") -> None:
         file_path = segments[-1] 
 
     try:
-        resp = requests.get(url)
+        resp = _session().get(url)
         resp.raise_for_status()
     except requests.RequestException as e:
-        logging.error(f"Failed to download from '{url}': {e}")
+        logger.error("Failed to download from '%s': %s", url, e)
 
     with open(file_path, "wb") as fout:
         fout.write(resp.content)
 
-    logging.info(f"File downloaded from '{url}' and saved to '{file_path}'")
+    logger.info("File downloaded from '%s' and saved to '%s'", url, file_path)
 
 def get_user_ip() -> Dict[str, Optional[str]]:
     """
@@ -393,6 +528,8 @@ def get_user_ip() -> Dict[str, Optional[str]]:
         
     """
     
+    import requests
+
     # Initialize a dictionary to store both IPv4 and IPv6 addresses
     ip_address = {"ipv4": None, "ipv6": None}
     
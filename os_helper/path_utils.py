@@ -13,14 +13,124 @@ Authors:
 
 import os
 import glob
+import fnmatch
+import functools
+import re
 import shutil
-import pathlib
-from typing import List
+import stat
+from typing import Iterator, List, Optional
 
 # Importing necessary functions from other utility modules
 # from .logging_utils import check, info, error
 import logging
 
+logger = logging.getLogger(__name__)
+
+
+def _scandir_recursive(
+    path: str,
+    skip_hidden: bool = True,
+    include_dirs: bool = False,
+) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield the file (and optionally directory) entries below a directory, using `os.scandir`.
+
+    The returned `os.DirEntry` objects cache their type information (and, on Windows,
+    their `stat` result), which saves the extra `stat` calls `os.walk` makes per entry.
+    Symbolic links to directories are not followed, and directories that cannot be read
+    are skipped, as with `os.walk`.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    path : str
+        The directory to traverse.
+    skip_hidden : bool, optional
+        If True, hidden entries (starting with '.') are skipped and hidden directories
+        are not descended into. Defaults to True.
+    include_dirs : bool, optional
+        If True, directories (and symbolic links to directories) are yielded too,
+        each one before its contents. Defaults to False.
+
+    Yields
+    ------
+    os.DirEntry
+        The entry of each file (and directory, if requested) found.
+    """
+    # A stack of open directory iterators instead of recursion: entries come out in the
+    # same depth-first order, without passing each one up a chain of nested generators.
+    # As with os.walk, directories that cannot be listed are silently skipped.
+    stack = []
+    it = _scandir_or_none(path)
+    if not (it is None):
+        stack.append(it)
+    try:
+        while stack:
+            try:
+                entry = next(stack[-1])
+            except (StopIteration, OSError):
+                stack.pop().close()
+                continue
+            if skip_hidden and entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if include_dirs:
+                    yield entry
+                # Descend now, then resume the current directory where it stopped
+                it = _scandir_or_none(entry.path)
+                if not (it is None):
+                    stack.append(it)
+            elif entry.is_file() or (include_dirs and entry.is_dir()):
+                yield entry
+    finally:
+        for it in stack:
+            it.close()
+
+
+def _scandir_or_none(path: str) -> Optional[Iterator[os.DirEntry]]:
+    """
+    Open a directory listing, returning None instead of raising if it cannot be read.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    path : str
+        The directory to list.
+
+    Returns
+    -------
+    Optional[Iterator[os.DirEntry]]
+        The `os.scandir` iterator, or None if the directory is missing or unreadable.
+    """
+    try:
+        return os.scandir(path)
+    except OSError:
+        return None
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """
+    Stat a path, following symbolic links, returning None instead of raising if it is missing.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    path : str
+        The path to stat.
+
+    Returns
+    -------
+    Optional[os.stat_result]
+        The stat result, or None if the path cannot be stat-ed.
+    """
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
 
 def folder_name_ext(path: str, checkpath: bool = False) -> tuple:
     """
@@ -44,26 +154,33 @@ def folder_name_ext(path: str, checkpath: bool = False) -> tuple:
     -------
     >>> folder_name_ext("/path/to/file.txt")
     ("/path/to", "file", "txt")
+
+    >>> folder_name_ext("/path/to/.env.local")
+    ("/path/to", ".env", "local")
     """
 
-    path = relative2absolute_path(path)
+    # Absolute paths only need normalizing, which spares the working directory lookup
+    path = os.path.normpath(path) if os.path.isabs(path) else relative2absolute_path(path)
+
+    # A single stat answers both the existence check and the directory test
+    st = _stat_or_none(path)
+    mode = 0 if st is None else st.st_mode
     if checkpath:
-        assert file_exists(path) or dir_exists(path), f"Path does not exist: {path}"
+        assert stat.S_ISREG(mode) or stat.S_ISDIR(mode), f"Path does not exist: {path}"
 
     base_folder = os.path.dirname(path)
     basename = os.path.basename(path)
 
     # If it's a directory, return empty extension
-    if os.path.isdir(path):
+    if stat.S_ISDIR(mode):
         return base_folder, basename, ""
 
-    # Split at the first dot (if any) for multi-part extensions
-    if "." in basename:
-        name_part, ext_part = basename.split(".", 1)
-    else:
-        name_part, ext_part = basename, ""
+    # Split at the first dot (if any) for multi-part extensions, e.g. "archive.tar.gz".
+    # A leading dot belongs to the name, so ".bashrc" has no extension.
+    offset = 1 if basename.startswith(".") else 0
+    name_part, _, ext_part = basename[offset:].partition(".")
 
-    return base_folder, name_part, ext_part
+    return base_folder, basename[:offset] + name_part, ext_part
 
 def file_exists(file_path: str, check_empty: bool = False) -> bool:
     """
@@ -88,11 +205,10 @@ def file_exists(file_path: str, check_empty: bool = False) -> bool:
     >>> file_exists("empty.txt", check_empty=True)
     False
     """
-    exists = os.path.isfile(file_path)
-    if check_empty and exists:
-        size = os.path.getsize(file_path)
-        exists = size > 0
-    return exists
+    st = _stat_or_none(file_path)
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return False
+    return st.st_size > 0 if check_empty else True
 
 def dir_exists(path: str, check_empty: bool = False) -> bool:
     """
@@ -120,9 +236,13 @@ def dir_exists(path: str, check_empty: bool = False) -> bool:
     if not os.path.isdir(path):
         return False
     if check_empty:
-        # Exclude hidden files/directories
-        files = [f for f in glob.glob(os.path.join(path, "*")) if not os.path.basename(f).startswith(".")]
-        return len(files) > 0
+        # Exclude hidden files/directories, and stop at the first visible entry
+        try:
+            with os.scandir(path) as it:
+                return any(not entry.name.startswith(".") for entry in it)
+        except OSError:
+            # Unreadable (or just removed) directories cannot be shown to hold anything
+            return False
     return True
 
 def absolute2relative_path(path: str, base_path: str = None) -> str:
@@ -146,10 +266,14 @@ def absolute2relative_path(path: str, base_path: str = None) -> str:
     >>> absolute2relative_path("/home/user/project/file.txt", "/home/user")
     'project/file.txt'
     """
+    # Look the working directory up at most once; relpath only normalizes absolute inputs
+    cwd = None
+    if base_path is None or not (os.path.isabs(path) and os.path.isabs(base_path)):
+        cwd = os.getcwd()
     if base_path is None:
-        base_path = os.getcwd()
-    abs_path = os.path.abspath(path)
-    abs_base = os.path.abspath(base_path)
+        base_path = cwd
+    abs_path = path if os.path.isabs(path) else os.path.join(cwd, path)
+    abs_base = base_path if os.path.isabs(base_path) else os.path.join(cwd, base_path)
     return os.path.relpath(abs_path, abs_base)
 
 def relative2absolute_path(path: str, checkpath: bool = False) -> str:
@@ -181,9 +305,46 @@ def relative2absolute_path(path: str, checkpath: bool = False) -> str:
     abs_path = os.path.abspath(path)
     if checkpath:
         if not (file_exists(abs_path) or dir_exists(abs_path)):
-            logging.error(f"File or directory does not exist: {abs_path}")
+            logger.error("File or directory does not exist: %s", abs_path)
     return abs_path
 
+
+# The home directory does not change during a run: resolve it once (expanduser may query
+# the password database) rather than on every `path_without_home` call
+_HOME = os.path.normpath(os.path.expanduser("~"))
+_HOME_SEP = os.path.join(_HOME, "")
+
+
+def _is_normalized(path: str) -> bool:
+    """
+    Tell, with a few substring tests, whether `os.path.normpath` would leave a path unchanged.
+
+    The test is conservative: some normalized paths (e.g. with hidden components) are
+    reported as not normalized, never the other way around.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    path : str
+        The path to check.
+
+    Returns
+    -------
+    bool
+        True if the path is known to be normalized already.
+    """
+    sep = os.sep
+    return not (
+        not path
+        or path.startswith(".")
+        or sep + sep in path
+        or sep + "." in path
+        or (len(path) > 1 and path.endswith(sep))
+        or (os.altsep and os.altsep in path)
+    )
+
+
 def path_without_home(path: str) -> str:
     """
     Convert an absolute path to be relative to the user's home directory by replacing the home path with '~'.
@@ -203,15 +364,39 @@ def path_without_home(path: str) -> str:
     >>> path_without_home("/home/user/project/file.txt")
     '~/project/file.txt'
     """
-    home_dir = os.path.expanduser("~")
-    norm_path = os.path.normpath(path)
-    if norm_path.startswith(home_dir):
-        return norm_path.replace(home_dir, "~", 1)
+    # Paths built by this module (e.g. with `join`) are already normalized
+    norm_path = path if _is_normalized(path) else os.path.normpath(path)
+    if norm_path == _HOME:
+        return "~"
+    # Compare with the separator appended, so that "/home/user2" is not taken for "/home/user"
+    if norm_path.startswith(_HOME_SEP):
+        return "~" + norm_path[len(_HOME):]
     return norm_path
 
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """
+    Compile a glob pattern into a regular expression, remembering recent patterns.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    pattern : str
+        The (case-normalized) glob pattern, e.g. "*.txt".
+
+    Returns
+    -------
+    re.Pattern
+        The compiled regular expression matching whole names.
+    """
+    return re.compile(fnmatch.translate(pattern))
+
+
 def recursive_glob(root_dir: str, pattern: str) -> List[str]:
     """
-    Recursively search for files matching a specified pattern within a directory.
+    Recursively search for files and folders matching a specified pattern within a directory.
 
     Parameters
     ----------
@@ -223,19 +408,32 @@ def recursive_glob(root_dir: str, pattern: str) -> List[str]:
     Returns
     -------
     List[str]
-        A list of file paths that match the pattern.
+        A list of the file and directory paths that match the pattern
+        (empty if `root_dir` does not exist).
 
     Example
     -------
     >>> recursive_glob("/home/user", "*.txt")
     ['/home/user/file1.txt', '/home/user/docs/file2.txt']
     """
-    matches = []
-    for root, dirs, files in os.walk(root_dir):
-        # Use glob.glob to match the pattern within the current directory
-        for file in glob.glob(os.path.join(root, pattern)):
-            matches.append(file)
-    return matches
+    if os.sep in pattern or (os.altsep and os.altsep in pattern):
+        # Patterns spanning several path components are matched by glob in every directory
+        matches = []
+        for root, dirs, files in os.walk(root_dir):
+            matches.extend(glob.glob(os.path.join(root, pattern)))
+        return matches
+
+    # One scandir pass matching names, instead of listing every directory twice (walk + glob).
+    # As with glob, directories match too, and hidden names only match patterns that start with '.'
+    match_hidden = pattern.startswith(".")
+    # Compiled once per pattern; names are case-normalized as fnmatch.fnmatch does
+    match = _compile_glob(os.path.normcase(pattern)).match
+    normcase = os.path.normcase
+    return [
+        entry.path
+        for entry in _scandir_recursive(root_dir, skip_hidden=False, include_dirs=True)
+        if (match_hidden or not entry.name.startswith(".")) and match(normcase(entry.name))
+    ]
 
 def join(*args: str) -> str:
     """
@@ -263,8 +461,8 @@ def join(*args: str) -> str:
     if len(args) == 1 and isinstance(args[0], (list, tuple)):
         # If a single iterable is passed, unpack it
         args = args[0]
-    normalized_path = os.path.normpath(os.path.join(*args))
-    return relative2absolute_path(normalized_path, checkpath=False)
+    # abspath already normalizes, so a single pass suffices
+    return os.path.abspath(os.path.join(*args))
 
 
 def size_file(filepath: str) -> int:
@@ -286,7 +484,8 @@ def size_file(filepath: str) -> int:
     >>> size_file("example.txt")
     1024
     """
-    return os.path.getsize(filepath) if file_exists(filepath) else -1
+    st = _stat_or_none(filepath)
+    return st.st_size if not (st is None) and stat.S_ISREG(st.st_mode) else -1
 
 def checkfile(filepath: str, msg = "", check_empty: bool = False) -> None:
     """
@@ -310,21 +509,28 @@ def checkfile(filepath: str, msg = "", check_empty: bool = False) -> None:
     -------
     >>> checkfile("data.csv", msg="Data file missing", check_empty=True)
     """
-    assert file_exists(filepath), f"{msg} File '{filepath}' does not exist."
+    # One stat answers both checks
+    size = size_file(filepath)
+    assert size >= 0, f"{msg} File '{filepath}' does not exist."
     if check_empty:
-        size = size_file(filepath)
         assert size > 0, f"{msg} File '{filepath}' exists but is empty."
 
-def copyfile(source: str, destination: str) -> None:
+def copyfile(source: str, destination: str, preserve_metadata: bool = False) -> None:
     """
     Copy a file from source to destination.
 
+    Only the contents are copied by default, which the standard library does in-kernel
+    where possible (e.g. with `sendfile` on Linux).
+
     Parameters
     ----------
     source : str
         The path to the source file.
     destination : str
         The path to the destination file or directory.
+    preserve_metadata : bool, optional
+        If True, also copies the permission bits and timestamps, as `shutil.copy2` does.
+        Defaults to False.
 
     Raises
     ------
@@ -339,17 +545,20 @@ def copyfile(source: str, destination: str) -> None:
     source_abs = relative2absolute_path(source)
     destination_abs = relative2absolute_path(destination)
 
-    if dir_exists(destination_abs):
-        _, basename, ext = folder_name_ext(source_abs)
-        destination_abs = join(destination_abs, f"{basename}.{ext}")
+    if os.path.isdir(destination_abs):
+        # Same file name in the destination folder (no stat needed to decompose it)
+        destination_abs = os.path.join(destination_abs, os.path.basename(source_abs))
 
     assert source_abs != destination_abs, f"Source and destination paths are the same: '{source_abs}'"
     try:
-        shutil.copy2(source_abs, destination_abs)
+        if preserve_metadata:
+            shutil.copy2(source_abs, destination_abs)
+        else:
+            shutil.copyfile(source_abs, destination_abs)
         checkfile(destination_abs, msg=f"Failed to copy '{source}' to '{destination}'", check_empty=True)
-        logging.info(f"Copied '{source}' to '{destination_abs}' successfully.")
+        logger.info("Copied '%s' to '%s' successfully.", source, destination_abs)
     except Exception as e:
-        logging.error(f"Error copying file: {e}")
+        logger.error("Error copying file: %s", e)
 
 def remove_directory(folder_path: str) -> None:
     """
@@ -369,14 +578,14 @@ def remove_directory(folder_path: str) -> None:
     -------
     >>> remove_directory("/path/to/temp_folder")
     """
-    if dir_exists(folder_path):
-        try:
-            shutil.rmtree(folder_path)
-            logging.info(f"Removed directory: '{folder_path}'")
-        except Exception as e:
-            logging.error(f"Failed to remove directory '{folder_path}': {e}")
-    else:
-        logging.info(f"Directory '{folder_path}' does not exist, nothing to remove.")
+    # Ask forgiveness rather than permission: no separate existence check
+    try:
+        shutil.rmtree(folder_path)
+        logger.info("Removed directory: '%s'", folder_path)
+    except FileNotFoundError:
+        logger.info("Directory '%s' does not exist, nothing to remove.", folder_path)
+    except Exception as e:
+        logger.error("Failed to remove directory '%s': %s", folder_path, e)
 
 def remove_files(files_list: List[str]) -> None:
     """
@@ -397,14 +606,14 @@ def remove_files(files_list: List[str]) -> None:
     >>> remove_files(["temp1.txt", "temp2.log"])
     """
     for file_path in files_list:
-        if file_exists(file_path):
-            try:
-                pathlib.Path(file_path).unlink()
-                logging.info(f"Removed file: '{file_path}'")
-            except Exception as e:
-                logging.error(f"Failed to remove file '{file_path}': {e}")
-        else:
-            logging.info(f"File '{file_path}' does not exist, skipping.")
+        # Ask forgiveness rather than permission: no separate existence check
+        try:
+            os.unlink(file_path)
+            logger.info("Removed file: '%s'", file_path)
+        except FileNotFoundError:
+            logger.info("File '%s' does not exist, skipping.", file_path)
+        except Exception as e:
+            logger.error("Failed to remove file '%s': %s", file_path, e)
 
 def make_directory(folder_path: str, exist_ok: bool = True) -> None:
     """
@@ -429,6 +638,6 @@ def make_directory(folder_path: str, exist_ok: bool = True) -> None:
     try:
         os.makedirs(folder_path, exist_ok=exist_ok)
         assert dir_exists(folder_path), f"Failed to create directory: '{folder_path}'"
-        logging.info(f"Directory created: '{folder_path}'")
+        logger.info("Directory created: '%s'", folder_path)
     except Exception as e:
-        logging.error(f"Error creating directory '{folder_path}': {e}")
+        logger.error("Error creating directory '%s': %s", folder_path, e)
@@ -14,7 +14,7 @@ Authors:
 import re
 import string
 import unicodedata
-from typing import Optional
+from typing import Dict, Optional
 
 # Importing necessary functions from other utility modules
 # from .logging_utils import error, check, info
@@ -45,16 +45,20 @@ def emptystring(s: Optional[str]) -> bool:
     >>> emptystring("hello")
     False
     """
-    if s is None:
-        return True
-    
-    if isinstance(s, str):
-        if len(s.strip())==0:
-            return True
+    # isspace() checks in place instead of building a stripped copy
+    return s is None or (isinstance(s, str) and (not s or s.isspace()))
 
-    return False    
 
 
+# Runs of characters asciistring does not keep, with and without digits allowed
+_DISALLOWED_RUNS = {
+    True: re.compile(f"[^{string.ascii_letters}{string.digits}]+"),
+    False: re.compile(f"[^{string.ascii_letters}]+"),
+}
+
+# Compiled patterns collapsing runs of a replacement character, by replacement character
+_COLLAPSE_RUNS: Dict[str, re.Pattern] = {}
+
 
 def asciistring(
     input_string: str,
@@ -97,23 +101,20 @@ def asciistring(
     # Normalize Unicode characters to decompose accents (e.g., é -> e + ´)
     normalized_string = unicodedata.normalize('NFKD', input_string)
 
-    # Define the set of allowed characters
-    allowed_chars = string.ascii_letters
-    if allow_digits:
-        allowed_chars += string.digits
-
     # Optionally convert to lowercase
     if lower:
         normalized_string = normalized_string.lower()
 
-    # Replace disallowed characters with the replacement_char
-    result = ''.join(
-        c if c in allowed_chars and ord(c) < 128 else replacement_char
-        for c in normalized_string
-    )
+    # Replace each run of disallowed characters with a single replacement_char, in one C-level pass
+    disallowed_runs = _DISALLOWED_RUNS[bool(allow_digits)]
+    result = disallowed_runs.sub(replacement_char, normalized_string)
 
-    # Use regex to replace multiple consecutive replacement characters with a single one
-    result = re.sub(f'{re.escape(replacement_char)}+', replacement_char, result)
+    # A replacement_char made of allowed characters can still form runs with the input's own
+    if not disallowed_runs.fullmatch(replacement_char):
+        collapse = _COLLAPSE_RUNS.get(replacement_char)
+        if collapse is None:
+            collapse = _COLLAPSE_RUNS[replacement_char] = re.compile(f'{re.escape(replacement_char)}+')
+        result = collapse.sub(replacement_char, result)
 
     # Strip any leading or trailing replacement characters
     return result.strip(replacement_char)
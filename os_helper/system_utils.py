@@ -11,15 +11,26 @@ Authors:
 - Bachir Zerroug, https://www.linkedin.com/in/bachirzerroug
 """
 
+import functools
 import logging
 import os
-import platform
 import shlex
-from subprocess import PIPE, Popen
+import sys
+import subprocess
+from typing import List, Tuple, Union
 
 # Assuming these come from your other utility modules:
 from .path_utils import file_exists, dir_exists
 
+logger = logging.getLogger(__name__)
+
+# The platform never changes during the life of the process: detect it once at import
+_PLATFORM = sys.platform.lower()
+_IS_WINDOWS = _PLATFORM.startswith("win")
+_IS_LINUX = _PLATFORM.startswith("linux")
+_IS_MACOS = _PLATFORM.startswith("darwin")
+_IS_UNIX = _IS_LINUX or _IS_MACOS
+
 def windows() -> bool:
     """
     Determine if the current operating system is Windows.
@@ -29,7 +40,7 @@ def windows() -> bool:
     bool
         True if the operating system is Windows, False otherwise.
     """
-    return platform.lower().startswith("win")
+    return _IS_WINDOWS
 
 
 def linux() -> bool:
@@ -41,7 +52,7 @@ def linux() -> bool:
     bool
         True if the operating system is Linux, False otherwise.
     """
-    return platform.lower().startswith("linux")
+    return _IS_LINUX
 
 
 def macos() -> bool:
@@ -53,7 +64,7 @@ def macos() -> bool:
     bool
         True if the operating system is macOS, False otherwise.
     """
-    return platform.lower().startswith("darwin")
+    return _IS_MACOS
 
 
 def unix() -> bool:
@@ -65,7 +76,36 @@ def unix() -> bool:
     bool
         True if the operating system is Unix-based (Linux or macOS), False otherwise.
     """
-    return linux() or macos()
+    return _IS_UNIX
+
+
+# Number of CPUs this process may run on, computed on first use by `_usable_cpu_count`
+_CPU_COUNT = None
+
+
+def _usable_cpu_count() -> int:
+    """
+    Get the number of CPUs the current process is allowed to run on.
+
+    Unlike `os.cpu_count`, this honours CPU affinity (taskset, cpusets, container limits)
+    where the platform exposes it. The count is computed once, then reused.
+
+    You should not use it directly.
+
+    Returns
+    -------
+    int
+        The number of usable CPUs, at least 1.
+    """
+    global _CPU_COUNT
+    if _CPU_COUNT is None:
+        try:
+            count = len(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            # No affinity API (Windows, macOS): fall back to the machine's CPU count
+            count = os.cpu_count()
+        _CPU_COUNT = count or 1
+    return _CPU_COUNT
 
 
 def get_nb_workers(workers:int = -1) -> int:
@@ -76,7 +116,7 @@ def get_nb_workers(workers:int = -1) -> int:
     ----------
     workers : int, optional
         The number of workers to use. If set to 0, the function will use the number of CPUs
-        available on the system. If set to a positive integer, it will use that number of workers.
+        available to the process. If set to a positive integer, it will use that number of workers.
         If set to a negative integer, it will use the number of CPUs minus that integer. Defaults to -1.
         (following scikit-learn's convention)
         
@@ -90,12 +130,12 @@ def get_nb_workers(workers:int = -1) -> int:
     >>> get_nb_workers()  # Retrieve the number of workers
     4 # corresponding to the number of CPU cores available on the system
     """
-    nb_workers = os.cpu_count() or 1  # Fallback to 1 if somehow os.cpu_count() is None
+    nb_workers = _usable_cpu_count()
     if "NB_WORKERS" in os.environ:
         try:
             nb_workers = int(os.environ["NB_WORKERS"])
         except ValueError:
-            info("NB_WORKERS environment variable is invalid. Using default CPU count.")
+            logger.warning("NB_WORKERS environment variable is invalid. Using default CPU count.")
         
     if workers == 0:
         return nb_workers
@@ -119,8 +159,31 @@ def getpid() -> str:
     """
     return str(os.getpid())
 
+@functools.lru_cache(maxsize=256)
+def _split_command(cmd: str) -> Tuple[str, ...]:
+    """
+    Split a command line into arguments with shell-like syntax, remembering recent commands.
+
+    Commands are often run repeatedly with the same command line, and `shlex.split`
+    tokenizes in pure Python.
+
+    You should not use it directly.
+
+    Parameters
+    ----------
+    cmd : str
+        The command line to split.
+
+    Returns
+    -------
+    Tuple[str, ...]
+        The arguments, as an immutable tuple so that the cached value cannot be altered.
+    """
+    return tuple(shlex.split(cmd))
+
+
 def system(
-    cmd: str,
+    cmd: Union[str, List[str]],
     expected_output: str = "",
     check_exitcode: bool = True,
     check_empty: bool = False
@@ -130,8 +193,9 @@ def system(
 
     Parameters
     ----------
-    cmd : str
-        The system command to run.
+    cmd : str or list of str
+        The system command to run. A list of arguments is passed as-is,
+        a string is split with shell-like syntax first.
     expected_output : str, optional
         Expected output file or directory. If provided, checks for its existence
         after the command runs. Defaults to "".
@@ -151,14 +215,19 @@ def system(
         If the command fails (non-zero exit code) or if the expected output
         does not exist or is empty (depending on `check_empty`).
     """
-    logging.info(f"Executing system command: {cmd}")
+    logger.info("Executing system command: %s", cmd)
     
-    args = shlex.split(cmd)
-    proc = Popen(args, stdout=PIPE, stderr=PIPE, shell=False)
-    out_bytes, err_bytes = proc.communicate()
-
-    out_str = out_bytes.decode("utf-8", errors="replace") if out_bytes else ""
-    err_str = err_bytes.decode("utf-8", errors="replace") if err_bytes else ""
+    args = list(_split_command(cmd)) if isinstance(cmd, str) else cmd
+    proc = subprocess.run(
+        args,
+        capture_output=True,
+        encoding="utf-8",
+        errors="replace",
+        check=False,
+    )
+
+    out_str = proc.stdout or ""
+    err_str = proc.stderr or ""
 
     # Check exit code
     if check_exitcode:
@@ -188,7 +257,7 @@ def openfile(filename: str) -> None:
     OSError
         If there's an error opening the file with the system's default application.
     """
-    logging.info(f"Opening file '{filename}' with default application.")
+    logger.info("Opening file '%s' with default application.", filename)
     
     try:
         if windows():
@@ -201,7 +270,9 @@ def openfile(filename: str) -> None:
         if linux():
             cmd = "xdg-open"
         
-        system(f"{cmd} {filename}", check_exitcode=True)
+        # Passing a list keeps filenames with spaces intact
+        system([cmd, filename], check_exitcode=True)
         
     except Exception as e:
-        raise SystemExit(f"Failed to open file '{filename}': System OS is not supported.")
\ No newline at end of file
+        # A regular exception lets callers handle the failure instead of exiting the interpreter
+        raise OSError(f"Failed to open file '{filename}': {e}") from e
\ No newline at end of file
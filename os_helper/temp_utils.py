@@ -12,18 +12,18 @@ Authors:
 """
 
 import tempfile
-import hashlib
 import os
 import contextlib
 from typing import Generator
 
 # Importing necessary functions from other utility modules
 import logging
-from .path_utils import join, relative2absolute_path
+from .path_utils import join
 from .misc_utils import now_string
-from .hash_utils import hash_string
 import shutil
 
+logger = logging.getLogger(__name__)
+
 
 @contextlib.contextmanager
 def temporary_filename(
@@ -67,9 +67,8 @@ def temporary_filename(
         # Ensure the suffix starts with a dot if provided
         suffix = suffix if suffix.startswith(".") else f".{suffix}"
         
-        # Create a unique prefix using the current timestamp and a hash
+        # Prefix with the current timestamp; tempfile adds the random part that makes the name unique
         unique_prefix = f"{prefix}-{now_string('filename')}-" if prefix else ""
-        unique_prefix += hash_string(now_string(), size=8)
         
         # Create the temporary file
         with tempfile.NamedTemporaryFile(
@@ -78,18 +77,19 @@ def temporary_filename(
             prefix=unique_prefix,
             delete=not delete
         ) as tmp:
-            temp_path = relative2absolute_path(tmp.name)
-            logging.info(f"Created temporary file: {temp_path}")
+            # tempfile names are already absolute, as they live in the absolute tempfile.gettempdir()
+            temp_path = tmp.name
+            logger.info("Created temporary file: %s", temp_path)
             yield temp_path
     except Exception as e:
-        logging.error(f"Failed to create temporary file: {e}")
+        logger.error("Failed to create temporary file: %s", e)
     finally:
         if delete and os.path.exists(temp_path):
             try:
                 os.unlink(temp_path)
-                logging.info(f"Deleted temporary file: {temp_path}")
+                logger.info("Deleted temporary file: %s", temp_path)
             except Exception as e:
-                logging.error(f"Failed to delete temporary file '{temp_path}': {e}")
+                logger.error("Failed to delete temporary file '%s': %s", temp_path, e)
 
 
 @contextlib.contextmanager
@@ -123,21 +123,19 @@ def temporary_folder(prefix: str = "", delete: bool = True) -> Generator[str, No
     ...     # temp_dir and its contents are automatically deleted after the block
     """
     try:
-        # Create a unique prefix using the current timestamp and a hash
+        # Prefix with the current timestamp; tempfile adds the random part that makes the name unique
         unique_prefix = f"{prefix}-{now_string('filename')}-" if prefix else ""
-        unique_prefix += hashlib.md5(now_string().encode()).hexdigest()[:8]
         
         # Create the temporary directory
         temp_dir = tempfile.mkdtemp(prefix=unique_prefix)
-        temp_dir = relative2absolute_path(temp_dir)
-        logging.info(f"Created temporary directory: {temp_dir}")
+        logger.info("Created temporary directory: %s", temp_dir)
         yield temp_dir
     except Exception as e:
-        logging.error(f"Failed to create temporary directory: {e}")
+        logger.error("Failed to create temporary directory: %s", e)
     finally:
         if delete and os.path.exists(temp_dir):
             try:
                 shutil.rmtree(temp_dir)
-                logging.info(f"Deleted temporary directory: {temp_dir}")
+                logger.info("Deleted temporary directory: %s", temp_dir)
             except Exception as e:
-                logging.error(f"Failed to delete temporary directory '{temp_dir}': {e}")
\ No newline at end of file
+                logger.error("Failed to delete temporary directory '%s': %s", temp_dir, e)
\ No newline at end of file
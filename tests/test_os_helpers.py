@@ -1,20 +1,43 @@
 import os
+import sys
 import json
+import hashlib
 import time
 import yaml
+import zipfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 import pytest
 from os_helper import (
+    windows,
+    linux,
+    macos,
+    unix,
+    get_nb_workers,
+    system,
     emptystring,
     now_string,
+    time2str,
+    format_size,
+    is_working_url,
+    is_working_urls,
     file_exists,
     dir_exists,
     relative2absolute_path,
+    path_without_home,
+    folder_name_ext,
     temporary_folder,
     temporary_filename,
     asciistring,
     zip_folder,
     recursive_glob,
+    remove_files,
+    copyfile,
+    size_file,
+    remove_directory,
     get_config,
+    hash_string,
+    hashfile,
     hashfolder,
     join,
 )
@@ -42,6 +65,29 @@ def setup_teardown():
     os.rmdir(TEST_FOLDER)  # Remove the test folder itself
 
 
+def test_all_exports():
+    """
+    Test that every name listed in `os_helper.__all__` can be resolved.
+    """
+    import os_helper
+    for name in os_helper.__all__:
+        assert callable(getattr(os_helper, name)), name  # Every export is a function
+    for module in os_helper._SUBMODULES:
+        # Submodules are reachable as attributes, as with eager imports
+        assert getattr(os_helper, module).__name__ == f"os_helper.{module}"
+
+
+def test_os_detection():
+    """
+    Test the operating system detection functions.
+
+    - Verifies they return booleans and that `unix` covers Linux and macOS.
+    """
+    assert all(isinstance(f(), bool) for f in (windows, linux, macos, unix))
+    assert unix() == (linux() or macos())  # Unix means Linux or macOS
+    assert not (windows() and unix())  # Mutually exclusive
+
+
 def test_emptystring():
     """
     Test the `emptystring` function.
@@ -70,6 +116,135 @@ def test_now_string():
     assert ":" not in filename_format  # Filename format should exclude ":"
 
 
+def test_get_nb_workers(monkeypatch):
+    """
+    Test the `get_nb_workers` function.
+
+    - Verifies explicit counts and the fallback on an invalid NB_WORKERS value.
+    """
+    assert get_nb_workers(3) == 3
+    monkeypatch.setenv("NB_WORKERS", "not-a-number")
+    # Invalid value falls back to the number of CPUs the process may run on
+    usable = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    assert get_nb_workers(0) == usable
+    monkeypatch.setenv("NB_WORKERS", "4")
+    assert get_nb_workers(0) == 4
+    assert get_nb_workers(-2) == 3
+
+
+def test_system():
+    """
+    Test the `system` function.
+
+    - Verifies string and list commands give the same output.
+    - Verifies a failing command raises when exit codes are checked.
+    """
+    python = sys.executable
+    as_list = system([python, "-c", "print('a b')"])
+    as_string = system(f'"{python}" -c "print(\'a b\')"')
+    assert as_list["out"].strip() == as_string["out"].strip() == "a b"
+    with pytest.raises(AssertionError):
+        system([python, "-c", "raise SystemExit(3)"])
+
+
+def test_time2str():
+    """
+    Test the `time2str` function.
+
+    - Verifies the hour/minute/second breakdown, with and without spaces.
+    """
+    assert time2str(0) == "0 sec"
+    assert time2str(3661.0) == "1 hr 1 min 1 sec"
+    assert time2str(5400.0, no_space=True) == "1hr 30min"
+    assert time2str(40 * 86400) == "960 hr"  # Hours keep counting past a month
+
+
+def test_format_size():
+    """
+    Test the `format_size` function.
+
+    - Verifies each unit and the boundaries between them.
+    """
+    assert format_size(0) == "0 B"
+    assert format_size(1000) == "1000 B"  # Units switch strictly above the threshold
+    assert format_size(1500) == "1.50 KB"
+    assert format_size(2_500_000) == "2.50 MB"
+    assert format_size(3 * 10**9 + 1) == "3.00 GB"
+    assert format_size(4.2e12) == "4.20 TB"
+
+
+def test_is_working_urls():
+    """
+    Test the `is_working_urls` function offline.
+
+    - Verifies invalid URLs are rejected, keeping the order of the inputs.
+    """
+    assert is_working_urls([]) == []
+    assert is_working_urls(["not a url", "http//missing-colon", "ftp:/broken"]) == [False, False, False]
+
+
+def test_is_working_url_local_server():
+    """
+    Test the `is_working_url` function against a local HTTP server.
+
+    - Verifies a server refusing HEAD requests is still seen as working.
+    - Verifies error statuses are reported as not working, and not remembered.
+    """
+    ok_paths = {"/ok"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(405)  # HEAD is not allowed, GET must be used instead
+            self.end_headers()
+
+        def do_GET(self):
+            self.send_response(200 if self.path in ok_paths else 404)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass  # Keep the test output quiet
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        assert is_working_url(f"{base}/ok") is True
+        assert is_working_url(f"{base}/missing") is False
+        ok_paths.add("/missing")
+        assert is_working_url(f"{base}/missing") is True  # A failure is not cached
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_folder_name_ext():
+    """
+    Test the `folder_name_ext` function.
+
+    - Verifies multi-part extensions are kept whole.
+    - Verifies a leading dot belongs to the name.
+    """
+    folder = os.path.abspath(TEST_FOLDER)
+    assert folder_name_ext(os.path.join(folder, "archive.tar.gz")) == (folder, "archive", "tar.gz")
+    assert folder_name_ext(os.path.join(folder, ".bashrc")) == (folder, ".bashrc", "")
+    assert folder_name_ext(os.path.join(folder, ".env.local")) == (folder, ".env", "local")
+    assert folder_name_ext(os.path.join(folder, "README")) == (folder, "README", "")
+    assert folder_name_ext(folder)[2] == ""  # Directories have no extension
+
+
+def test_path_without_home():
+    """
+    Test the `path_without_home` function.
+
+    - Verifies the home directory is replaced by '~' only on whole path components.
+    """
+    home = os.path.normpath(os.path.expanduser("~"))
+    assert path_without_home(home) == "~"
+    assert path_without_home(os.path.join(home, "project", "file.txt")) == os.path.join("~", "project", "file.txt")
+    assert path_without_home(home + "2") == home + "2"  # A sibling folder sharing the prefix is kept
+
+
 def test_file_exists():
     """
     Test the `file_exists` function.
@@ -123,6 +298,8 @@ def test_asciistring():
     assert asciistring("Café-Con-Leche!") == "cafe-con-leche"  # Replace accented and special characters
     assert asciistring("Special#File$2024", lower=False) == "Special-File-2024"  # Preserve case
     assert asciistring("Café@2024.txt") == "cafe-2024-txt"  # Replace "@" with a hyphen
+    assert asciistring("File 2024 ## v2", allow_digits=False) == "file-v"  # Digits are replaced too
+    assert asciistring("File 2024", allow_digits=None) == "file"  # Any falsy value disallows digits
 
 
 def test_zip_folder():
@@ -139,9 +316,28 @@ def test_zip_folder():
     with open(file1, "w") as f1, open(file2, "w") as f2:
         f1.write("File 1 content")
         f2.write("File 2 content")
+    os.makedirs(join(test_dir, "sub"))
+    os.makedirs(join(test_dir, ".git"))
+    with open(join(test_dir, "sub", "file3.txt"), "w") as f3, open(join(test_dir, ".hidden"), "w") as fh:
+        f3.write("File 3 content")
+        fh.write("Hidden content")
+    with open(join(test_dir, ".git", "config"), "w") as fg, open(join(test_dir, ".git", ".keep"), "w") as fk:
+        fg.write("Visible file in a hidden folder")
+        fk.write("Hidden content")
     zip_file = os.path.join(TEST_FOLDER, "output.zip")  # Define zip file path
     zip_folder(test_dir, zip_file_path=zip_file)  # Zip the folder
     assert file_exists(zip_file)  # Verify the zip file exists
+    with zipfile.ZipFile(zip_file) as zf:
+        # Only hidden files are skipped, wherever they are, and names are relative to the folder
+        assert sorted(zf.namelist()) == [".git/config", "file1.txt", "file2.txt", "sub/file3.txt"]
+    with open(join(test_dir, "image.png"), "wb") as fi:
+        fi.write(b"\x89PNG" * 64)
+    zip_folder(test_dir + os.sep, zip_file_path=zip_file, compresslevel=1)  # A trailing separator is fine
+    with zipfile.ZipFile(zip_file) as zf:
+        # Already-compressed formats are stored, the rest is deflated
+        assert zf.getinfo("image.png").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("file1.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("sub/file3.txt").compress_type == zipfile.ZIP_DEFLATED
 
 
 def test_recursive_glob():
@@ -149,6 +345,7 @@ def test_recursive_glob():
     Test the `recursive_glob` function.
 
     - Creates a directory with files matching a pattern and verifies the function finds them.
+    - Verifies matching subfolders are returned too, hidden ones only for patterns starting with '.'.
     """
     test_dir = os.path.join(TEST_FOLDER, "test_recursive_glob")
     os.makedirs(test_dir)  # Create the test directory
@@ -162,6 +359,89 @@ def test_recursive_glob():
     assert len(files) == 2  # Verify two files are found
     assert file1 in files  # Verify specific file is found
     assert file2 in files  # Verify specific file is found
+    assert recursive_glob(os.path.join(test_dir, "missing"), "*.txt") == []  # Missing folders match nothing
+    assert recursive_glob(os.path.join(test_dir, "missing"), os.path.join("*", "*.txt")) == []
+    inner = join(test_dir, "sub1", "inner")
+    hidden = join(test_dir, ".hid")
+    os.makedirs(inner)
+    os.makedirs(hidden)
+    assert recursive_glob(test_dir, "sub*") == [join(test_dir, "sub1")]  # Folders match like files
+    assert recursive_glob(test_dir, "inner") == [inner]  # Nested folders are found
+    assert hidden not in recursive_glob(test_dir, "*")  # Hidden folders need a '.' pattern
+    assert recursive_glob(test_dir, ".*") == [hidden]
+
+
+def test_unreadable_subfolder(monkeypatch):
+    """
+    Test that folder traversals skip subfolders that cannot be read, as `os.walk` does.
+
+    - Makes listing one subfolder fail with PermissionError.
+    - Verifies `recursive_glob`, `hashfolder` and `zip_folder` still process the rest.
+    - Verifies `dir_exists` with `check_empty` reports the subfolder as empty instead of raising.
+    """
+    test_dir = os.path.join(TEST_FOLDER, "test_unreadable_subfolder")
+    locked = os.path.join(test_dir, "locked")
+    os.makedirs(locked)
+    visible = os.path.join(test_dir, "visible.txt")
+    for file_path in (visible, os.path.join(locked, "secret.txt")):
+        with open(file_path, "w") as f:
+            f.write("content")
+
+    real_scandir = os.scandir
+
+    def scandir(path="."):
+        if os.path.abspath(path) == os.path.abspath(locked):
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)  # chmod 000 would not stop root
+    assert recursive_glob(test_dir, "*.txt") == [visible]
+    assert isinstance(hashfolder(test_dir), str)
+    zip_file = os.path.join(TEST_FOLDER, "unreadable.zip")
+    zip_folder(test_dir, zip_file_path=zip_file)
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.namelist() == ["visible.txt"]
+    assert dir_exists(locked) is True  # It exists...
+    assert dir_exists(locked, check_empty=True) is False  # ...but nothing in it can be seen
+
+
+def test_copyfile():
+    """
+    Test the `copyfile` and `size_file` functions.
+
+    - Copies a file without extension into a folder and verifies its name and size.
+    """
+    test_dir = os.path.join(TEST_FOLDER, "test_copyfile")
+    os.makedirs(os.path.join(test_dir, "out"))
+    source = os.path.join(test_dir, "README")
+    with open(source, "w") as f:
+        f.write("Read me")
+    copyfile(source, os.path.join(test_dir, "out"))  # Copy into a folder
+    copied = os.path.join(test_dir, "out", "README")
+    assert size_file(copied) == size_file(source) == 7  # Same name, same content size
+    assert size_file(os.path.join(test_dir, "out")) == -1  # Folders have no file size
+    os.utime(source, (0, 0))
+    copyfile(source, os.path.join(test_dir, "kept.txt"), preserve_metadata=True)
+    assert os.stat(os.path.join(test_dir, "kept.txt")).st_mtime == 0  # Timestamps are copied on request
+
+
+def test_remove_files_and_directory():
+    """
+    Test the `remove_files` and `remove_directory` functions.
+
+    - Removes existing files and silently skips missing ones.
+    - Removes a directory tree and silently skips a missing one.
+    """
+    test_dir = os.path.join(TEST_FOLDER, "test_remove")
+    os.makedirs(os.path.join(test_dir, "sub"))
+    file1 = os.path.join(test_dir, "file1.txt")
+    with open(file1, "w") as f:
+        f.write("File 1 content")
+    remove_files([file1, os.path.join(test_dir, "missing.txt")])  # Missing files are skipped
+    assert not file_exists(file1)
+    remove_directory(test_dir)
+    assert not dir_exists(test_dir)
+    remove_directory(test_dir)  # Missing directories are skipped
 
 
 def test_get_config_env_files():
@@ -181,6 +461,63 @@ def test_get_config_env_files():
     assert config["db_url"] == "env_file_postgres_url"  # Verify key
 
 
+def test_get_config_files():
+    """
+    Test the `get_config` function with JSON/YAML files.
+
+    - Loads a YAML file given by its path.
+    - Loads a JSON file found in a folder.
+    """
+    config_dir = os.path.join(TEST_FOLDER, "test_get_config_files")
+    os.makedirs(config_dir)
+    yaml_path = os.path.join(config_dir, "config.yaml")
+    with open(yaml_path, "w") as f:
+        yaml.safe_dump({"host": "localhost", "port": 5432}, f)
+    config = get_config(keys=["host", "port"], config_type="database", path=yaml_path)
+    assert config == {"host": "localhost", "port": 5432}  # Loaded from the file path
+    os.remove(yaml_path)
+    with open(os.path.join(config_dir, ".config.json"), "w") as f:
+        json.dump({"host": "hidden.org", "port": 81}, f)  # Hidden files are ignored
+    with open(os.path.join(config_dir, "config.json"), "w") as f:
+        json.dump({"host": "example.org", "port": 80}, f)
+    config = get_config(keys=["host", "port"], config_type="database", path=config_dir)
+    assert config == {"host": "example.org", "port": 80}  # Found in the folder
+    config["host"] = "changed"
+    config = get_config(keys=["host", "port"], config_type="database", path=config_dir)
+    assert config["host"] == "example.org"  # Cached configurations are not shared with callers
+    with open(os.path.join(config_dir, "config.json"), "w") as f:
+        json.dump({"host": "example.com", "port": 8080}, f)
+    config = get_config(keys=["host", "port"], config_type="database", path=config_dir)
+    assert config == {"host": "example.com", "port": 8080}  # A rewritten file is parsed again
+
+
+def test_hash_string():
+    """
+    Test the `hash_string` function.
+
+    - Verifies the digest matches the SHA-256 reference value.
+    - Verifies the `size` parameter truncates the digest.
+    """
+    assert hash_string("example") == "50d858e0985ecc7f60418aaf0cc5ab587f42c2570a884095a9e8ccacd0f6545c"
+    assert hash_string("example", size=8) == "50d858e0"  # Truncated digest
+    full_hash = hash_string("example")
+    assert hash_string("example", size=100) == (full_hash * 2)[:100]  # Deterministic extension
+
+
+def test_hashfile():
+    """
+    Test the `hashfile` function.
+
+    - Verifies empty, small and multi-block files match hashlib's SHA-256.
+    """
+    for size in (0, 1000, 3 * (1 << 20) + 7):
+        file_path = os.path.join(TEST_FOLDER, f"test_hashfile_{size}.bin")
+        data = os.urandom(size)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        assert hashfile(file_path) == hashlib.sha256(data).hexdigest()
+
+
 def test_hashfolder_content():
     """
     Test the `hashfolder` function with content hashing.
@@ -203,6 +540,122 @@ def test_hashfolder_content():
     modified_hash = hashfolder(test_folder, hash_content=True)  # Recompute hash
     assert initial_hash != modified_hash  # Verify the hash changes
 
+def test_bounded_cache():
+    """
+    Test the bounded cache shared by the hashing, configuration and URL helpers.
+
+    - Verifies the oldest entry is evicted first and that updates do not evict.
+    """
+    from os_helper.cache_utils import _BoundedCache
+    cache = _BoundedCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("b", 3)  # Updating a key keeps every entry
+    assert len(cache) == 2 and cache.get("a") == 1
+    cache.put("c", 4)  # Full: "a", the oldest entry, is evicted
+    assert cache.get("a") is None and cache.get("b") == 3 and cache.get("c") == 4
+
+
+def test_hashfolder_portable_order():
+    """
+    Test that `hashfolder` folds files in the order of their '/'-separated relative paths.
+
+    - Builds a tree where "a/x" and "a0" would sort the other way with a '\\' separator.
+    - Verifies the hash matches a fold done by hand in portable order.
+    """
+    folder = os.path.join(TEST_FOLDER, "hashfolder_portable")
+    os.makedirs(os.path.join(folder, "a"))
+    contents = {"a/x": b"nested", "a0": b"sibling", "B": b"upper"}
+    for rel, data in contents.items():
+        with open(os.path.join(folder, *rel.split("/")), "wb") as f:
+            f.write(data)
+    expected = hashlib.sha256()
+    for rel in sorted(contents):  # "B" < "a/x" < "a0", as '/' sorts before digits
+        expected.update(rel.encode("utf-8") + b"\0" + hashlib.sha256(contents[rel]).digest())
+    assert hashfolder(folder) == expected.hexdigest()
+
+
+def test_hashfolder_deterministic():
+    """
+    Test that `hashfolder` is deterministic and accounts for file names.
+
+    - Creates two folders with the same files written in a different order and verifies the hashes match.
+    - Renames a file and verifies the hash changes.
+    """
+    folder_a = os.path.join(TEST_FOLDER, "hashfolder_a")
+    folder_b = os.path.join(TEST_FOLDER, "hashfolder_b")
+    os.makedirs(os.path.join(folder_a, "sub"))
+    os.makedirs(os.path.join(folder_b, "sub"))
+    contents = {"a.txt": "A", "b.txt": "B", os.path.join("sub", "c.txt"): "C"}
+    for folder, names in [(folder_a, sorted(contents)), (folder_b, sorted(contents, reverse=True))]:
+        for name in names:
+            with open(os.path.join(folder, name), "w") as f:
+                f.write(contents[name])
+    assert hashfolder(folder_a) == hashfolder(folder_b)  # Same tree, same hash
+    os.rename(os.path.join(folder_b, "a.txt"), os.path.join(folder_b, "d.txt"))
+    assert hashfolder(folder_a) != hashfolder(folder_b)  # Renaming changes the hash
+
+
+def test_hashfolder_digest_cache():
+    """
+    Test that `hashfolder` reuses the digests of unchanged files.
+
+    - Verifies a second call adds nothing to the digest cache.
+    - Rewrites one file with a new modification time and verifies only it is digested again.
+    """
+    from os_helper.hash_utils import _DIGEST_CACHE
+    _DIGEST_CACHE.clear()
+    folder = os.path.join(TEST_FOLDER, "hashfolder_cache")
+    os.makedirs(folder)
+    changed = os.path.join(folder, "changed.txt")
+    for name in ("changed.txt", "unchanged.txt"):
+        with open(os.path.join(folder, name), "w") as f:
+            f.write("content")
+    os.utime(changed, ns=(1_000_000_000, 1_000_000_000))
+    initial_hash = hashfolder(folder)
+    assert len(_DIGEST_CACHE) == 2  # Both files were digested
+    assert hashfolder(folder) == initial_hash
+    assert len(_DIGEST_CACHE) == 2  # Both digests were served from the cache
+    with open(changed, "w") as f:
+        f.write("new content")
+    os.utime(changed, ns=(2_000_000_000, 2_000_000_000))
+    assert hashfolder(folder) != initial_hash  # The rewritten file was read again
+    assert len(_DIGEST_CACHE) == 3  # ...and only that one
+
+
+def test_hash_fingerprint():
+    """
+    Test the `fingerprint` mode of `hashfile` and `hashfolder`.
+
+    - Verifies the fingerprint differs from the content digest.
+    - Verifies it changes when the modification time or the size changes.
+    - Verifies the folder fingerprint still depends on the relative paths.
+    """
+    folder = os.path.join(TEST_FOLDER, "hash_fingerprint")
+    os.makedirs(folder)
+    file_path = os.path.join(folder, "file.txt")
+    with open(file_path, "w") as f:
+        f.write("content")
+    os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))  # Fixed timestamps
+    fingerprint = hashfile(file_path, fingerprint=True)
+    assert fingerprint == hashfile(file_path, fingerprint=True)  # Stable while untouched
+    assert fingerprint != hashfile(file_path)  # Not a content digest
+    os.utime(file_path, ns=(2_000_000_000, 2_000_000_000))
+    touched = hashfile(file_path, fingerprint=True)
+    assert touched != fingerprint  # A new modification time changes it
+    with open(file_path, "a") as f:
+        f.write("more")
+    os.utime(file_path, ns=(2_000_000_000, 2_000_000_000))  # Same time, new size
+    assert hashfile(file_path, fingerprint=True) != touched
+
+    folder_fingerprint = hashfolder(folder, fingerprint=True)
+    assert folder_fingerprint != hashfolder(folder)  # Not a content digest
+    renamed = os.path.join(folder, "renamed.txt")
+    os.rename(file_path, renamed)  # Same size and modification time, new name
+    os.utime(renamed, ns=(2_000_000_000, 2_000_000_000))
+    assert hashfolder(folder, fingerprint=True) != folder_fingerprint  # Renaming changes it
+
+
 def test_temporary_folder():
     """
     Test the `temporary_folder` function.